@@ -5,7 +5,6 @@ from dataclasses import replace
 from pathlib import Path
 
 from swarm.config import Settings, settings
-from swarm.workflow import run_research_workflow
 
 
 def parse_args() -> argparse.Namespace:
@@ -49,6 +48,9 @@ def main() -> None:
     except ValueError as exc:
         raise SystemExit(str(exc)) from exc
 
+    # Deferred so argument errors and --help return without loading LangChain.
+    from swarm.workflow import run_research_workflow
+
     cfg: Settings = settings
     if args.evaluate is not None:
         cfg = replace(cfg, enable_evaluator=args.evaluate)
@@ -1,5 +1,21 @@
 """Collaborative research swarm package."""
 
-from .workflow import build_research_graph, run_research_workflow
+from __future__ import annotations
 
-__all__ = ["build_research_graph", "run_research_workflow"]
+from typing import Any
+
+__all__ = [
+    "arun_research_workflow",
+    "build_research_graph",
+    "run_research_workflow",
+    "run_research_workflow_batch",
+]
+
+
+def __getattr__(name: str) -> Any:
+    # Importing swarm.config should not drag in LangGraph and every agent.
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from . import workflow
+
+    return getattr(workflow, name)
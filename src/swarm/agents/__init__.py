@@ -1,8 +1,16 @@
-from .planner import PlannerAgent
-from .researcher import ResearcherAgent, ResearchTeamAgent
-from .publisher import PublisherAgent
-from .synthesizer import SynthesizerAgent
-from .evaluator import EvaluatorAgent
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Any
+
+_MODULES = {
+    "PlannerAgent": "planner",
+    "ResearcherAgent": "researcher",
+    "ResearchTeamAgent": "researcher",
+    "SynthesizerAgent": "synthesizer",
+    "PublisherAgent": "publisher",
+    "EvaluatorAgent": "evaluator",
+}
 
 __all__ = [
     "PlannerAgent",
@@ -12,3 +20,10 @@ __all__ = [
     "PublisherAgent",
     "EvaluatorAgent",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # Agents pull in LangChain; load them only when first referenced.
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(f".{_MODULES[name]}", __name__), name)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from functools import lru_cache
+from typing import Any, Coroutine, TypeVar
+
+from langchain_core.messages import SystemMessage
+from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
+from langchain_core.runnables import RunnableConfig
+
+
+T = TypeVar("T")
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    # LLM clients are shared across runs and their async connection pools stay bound to the
+    # loop that opened them, so sync callers reuse one background loop instead of asyncio.run.
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+
+
+async def run_in_background(coro: Coroutine[Any, Any, T]) -> T:
+    # Async callers may be on any loop (or a fresh asyncio.run each time); hop to the shared
+    # loop for the same reason as run_sync, without blocking the caller's loop.
+    return await asyncio.wrap_future(
+        asyncio.run_coroutine_threadsafe(coro, _background_loop())
+    )
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="swarm-async", daemon=True).start()
+    return _loop
+
+
+class BaseAgent:
+    """Shared prompt helpers for the LLM-backed agents."""
+
+    cache_system_prompt: bool = False
+    run_config: RunnableConfig | None = None
+
+    @staticmethod
+    def _run_config(enable_tracing: bool) -> RunnableConfig | None:
+        # An explicit empty handler list stops chains inheriting the graph's callbacks, so
+        # untraced runs skip run-tree bookkeeping and input serialization per call.
+        return None if enable_tracing else {"callbacks": []}
+
+    def _build_prompt(self, user: str, *system: str) -> ChatPromptTemplate:
+        return _cached_prompt(system, user, self.cache_system_prompt)
+
+
+@lru_cache(maxsize=None)
+def _cached_prompt(
+    system: tuple[str, ...], user: str, cache_system_prompt: bool
+) -> ChatPromptTemplate:
+    # Agents are rebuilt per workflow run; parse each distinct template pair only once.
+    return ChatPromptTemplate.from_messages(
+        [_system_message(system, cache_system_prompt), ("user", user)]
+    )
+
+
+def _system_message(
+    parts: tuple[str, ...], cache_system_prompt: bool
+) -> tuple[str, str] | SystemMessage:
+    # Anthropic needs explicit cache_control breakpoints; one per part lets a prefix shared
+    # across agents (e.g. the researcher guardrails) be cached even when later parts differ.
+    # The parts are rendered here, so they must be static.
+    if not cache_system_prompt:
+        return ("system", "\n".join(parts))
+    return SystemMessage(
+        content=[
+            {
+                "type": "text",
+                "text": PromptTemplate.from_template(part).format(),
+                "cache_control": {"type": "ephemeral"},
+            }
+            for part in parts
+        ]
+    )
@@ -3,55 +3,65 @@ from __future__ import annotations
 from typing import Any
 
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import Runnable
 
 from ..memory import MemoryStore
+from .base import BaseAgent
 
 
-class EvaluatorAgent:
+_SYSTEM_PROMPT = (
+    "You are a critical reviewer. Inspect the synthesis for unsupported claims, "
+    "missing evidence, and potential bias."
+)
+_USER_PROMPT = (
+    "Original question: {query}\n"
+    "Synthesis:\n{synthesis}\n"
+    "Research notes:\n{notes}\n"
+    "Provide:\n"
+    "1. Validation of well-supported insights.\n"
+    "2. Flagged claims needing verification.\n"
+    "3. Missing perspectives or follow-up questions."
+)
+
+
+class EvaluatorAgent(BaseAgent):
     """Reviews the synthesis for factual gaps, bias, or unanswered questions."""
 
-    def __init__(self, llm: Runnable, memory: MemoryStore) -> None:
+    def __init__(
+        self,
+        llm: Runnable,
+        memory: MemoryStore,
+        *,
+        cache_system_prompt: bool = False,
+        enable_tracing: bool = False,
+    ) -> None:
         self.llm = llm
         self.memory = memory
-        self.prompt = ChatPromptTemplate.from_messages(
-            [
-                (
-                    "system",
-                    "You are a critical reviewer. Inspect the synthesis for unsupported claims, "
-                    "missing evidence, and potential bias.",
-                ),
-                (
-                    "user",
-                    "Original question: {query}\n"
-                    "Synthesis:\n{synthesis}\n"
-                    "Research notes:\n{notes}\n"
-                    "Provide:\n"
-                    "1. Validation of well-supported insights.\n"
-                    "2. Flagged claims needing verification.\n"
-                    "3. Missing perspectives or follow-up questions.",
-                ),
-            ]
-        )
+        self.cache_system_prompt = cache_system_prompt
+        self.run_config = self._run_config(enable_tracing)
+        self.prompt = self._build_prompt(_USER_PROMPT, _SYSTEM_PROMPT)
         self.parser = StrOutputParser()
+        self.chain = self.prompt | self.llm | self.parser
 
     def __call__(self, state: dict[str, Any]) -> dict[str, Any]:
+        critique = self.chain.invoke(self.prompt_inputs(state), config=self.run_config)
+        return self.apply_output(state, critique)
+
+    def prompt_inputs(self, state: dict[str, Any]) -> dict[str, Any]:
         query = state["query"]
         synthesis: str = state.get("synthesis") or self.memory.read(query, "synthesis", "")
         drafts = state.get("drafts") or self.memory.read(query, "drafts", {})
         notes = self._format_notes(drafts)
-        critique = (self.prompt | self.llm | self.parser).invoke(
-            {"query": query, "synthesis": synthesis, "notes": notes}
-        )
-        self.memory.write(query, "critique", critique)
+        return {"query": query, "synthesis": synthesis, "notes": notes}
+
+    def apply_output(self, state: dict[str, Any], critique: str) -> dict[str, Any]:
+        self.memory.write(state["query"], "critique", critique)
         return {"critique": critique}
 
     def _format_notes(self, drafts: dict[str, dict[str, Any]]) -> str:
         if not drafts:
             return "No researcher notes available."
-        lines: list[str] = []
-        for idx, (topic, payload) in enumerate(drafts.items(), start=1):
-            summary = payload.get("summary", "")
-            lines.append(f"{idx}. {topic}\n{summary}")
-        return "\n\n".join(lines)
+        return "\n\n".join(
+            f"{idx}. {topic}\n{payload.get('summary', '')}"
+            for idx, (topic, payload) in enumerate(drafts.items(), start=1)
+        )
@@ -1,15 +1,27 @@
 from __future__ import annotations
 
+import re
 from typing import Any
 
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import Runnable
 
 from ..memory import MemoryStore
+from .base import BaseAgent
 
 
-class PlannerAgent:
+_BULLET_RE = re.compile(r"^\s*(?:[-*•]\s+|\d+\.\s*)?(.*?)\s*$")
+_SYSTEM_PROMPT = (
+    "You are a research planner. Break the user request into concise subtopics "
+    "that will guide researchers. Focus on coverage and avoid redundancy."
+)
+_USER_PROMPT = (
+    "User request: {query}\n"
+    "Provide between 3 and {max_subtopics} bullet points outlining the research plan."
+)
+
+
+class PlannerAgent(BaseAgent):
     """Breaks a user query into focused research subtopics."""
 
     def __init__(
@@ -17,47 +29,39 @@ class PlannerAgent:
         llm: Runnable,
         memory: MemoryStore,
         max_subtopics: int = 5,
+        *,
+        cache_system_prompt: bool = False,
+        enable_tracing: bool = False,
     ) -> None:
         self.llm = llm
         self.memory = memory
         self.max_subtopics = max_subtopics
-        self.prompt = ChatPromptTemplate.from_messages(
-            [
-                (
-                    "system",
-                    "You are a research planner. Break the user request into concise subtopics "
-                    "that will guide researchers. Focus on coverage and avoid redundancy.",
-                ),
-                (
-                    "user",
-                    "User request: {query}\n"
-                    "Provide between 3 and {max_subtopics} bullet points outlining the research plan.",
-                ),
-            ]
-        )
+        self.cache_system_prompt = cache_system_prompt
+        self.run_config = self._run_config(enable_tracing)
+        self.prompt = self._build_prompt(_USER_PROMPT, _SYSTEM_PROMPT)
         self.parser = StrOutputParser()
+        self.chain = self.prompt | self.llm | self.parser
 
     def __call__(self, state: dict[str, Any]) -> dict[str, Any]:
+        raw_plan: str = self.chain.invoke(self.prompt_inputs(state), config=self.run_config)
+        return self.apply_output(state, raw_plan)
+
+    def prompt_inputs(self, state: dict[str, Any]) -> dict[str, Any]:
+        return {"query": state["query"], "max_subtopics": self.max_subtopics}
+
+    def apply_output(self, state: dict[str, Any], raw_plan: str) -> dict[str, Any]:
         query = state["query"]
-        raw_plan: str = (self.prompt | self.llm | self.parser).invoke(
-            {"query": query, "max_subtopics": self.max_subtopics}
-        )
         subtopics = self._parse_plan(raw_plan)
         self.memory.write(query, "subtopics", subtopics)
         return {"subtopics": subtopics}
 
     def _parse_plan(self, raw_plan: str) -> list[str]:
-        bullet_markers = ("- ", "* ", "• ", "1.", "2.", "3.", "4.", "5.")
         subtopics: list[str] = []
         for line in raw_plan.splitlines():
-            stripped = line.strip()
-            if not stripped:
+            text = _BULLET_RE.match(line).group(1)
+            if not text:
                 continue
-            for marker in bullet_markers:
-                if stripped.startswith(marker):
-                    stripped = stripped[len(marker) :].strip()
-                    break
-            subtopics.append(stripped)
+            subtopics.append(text)
             if len(subtopics) >= self.max_subtopics:
                 break
         if not subtopics:
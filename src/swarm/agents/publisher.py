@@ -1,17 +1,31 @@
 from __future__ import annotations
 
+import os
 import re
 from pathlib import Path
 from typing import Any
 
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import Runnable
 
 from ..memory import MemoryStore
+from .base import BaseAgent
 
 
-class PublisherAgent:
+_CITATION_RE = re.compile(r"\[([0-9]+)\](?!\()")
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+_SYSTEM_PROMPT = (
+    "You craft concise report titles. Keep titles under 8 words, "
+    "informative, and free of punctuation except hyphens. Use underscores for spaces."
+)
+_USER_PROMPT = (
+    "Research question: {query}\n"
+    "Executive summary (truncated): {summary}\n"
+    "Return only the title text."
+)
+
+
+class PublisherAgent(BaseAgent):
     """Generates a concise report title and exports the synthesis to Markdown."""
 
     def __init__(
@@ -19,39 +33,40 @@ class PublisherAgent:
         llm: Runnable,
         memory: MemoryStore,
         output_dir: Path,
+        *,
+        cache_system_prompt: bool = False,
+        enable_tracing: bool = False,
     ) -> None:
         self.llm = llm
         self.memory = memory
+        self.cache_system_prompt = cache_system_prompt
+        self.run_config = self._run_config(enable_tracing)
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        self.prompt = ChatPromptTemplate.from_messages(
-            [
-                (
-                    "system",
-                    "You craft concise report titles. Keep titles under 8 words, "
-                    "informative, and free of punctuation except hyphens. Use underscores for spaces.",
-                ),
-                (
-                    "user",
-                    "Research question: {query}\n"
-                    "Executive summary (truncated): {summary}\n"
-                    "Return only the title text.",
-                ),
-            ]
-        )
+        self.prompt = self._build_prompt(_USER_PROMPT, _SYSTEM_PROMPT)
         self.parser = StrOutputParser()
+        self.chain = self.prompt | self.llm | self.parser
 
     def __call__(self, state: dict[str, Any]) -> dict[str, Any]:
+        title = state.get("report_title") or self.generate_title(state)
+        return self.apply_output(state, title)
+
+    def prepare(self, state: dict[str, Any]) -> dict[str, Any]:
+        if state.get("report_title"):
+            return {}
+        return {"report_title": self.generate_title(state)}
+
+    def generate_title(self, state: dict[str, Any]) -> str:
+        return self.chain.invoke(self.prompt_inputs(state), config=self.run_config).strip()
+
+    def prompt_inputs(self, state: dict[str, Any]) -> dict[str, Any]:
+        summary = self._linked_synthesis(state)[:500]
+        return {"query": state["query"], "summary": summary}
+
+    def apply_output(self, state: dict[str, Any], title: str) -> dict[str, Any]:
         query = state["query"]
-        synthesis = state.get("synthesis") or self.memory.read(query, "synthesis", "")
-        citations = state.get("citation_entries") or self.memory.read(
-            query, "citation_entries", []
-        )
-        synthesis_with_links = self._inject_citation_links(synthesis, citations)
-        summary = synthesis_with_links[:500]
-        title = (self.prompt | self.llm | self.parser).invoke(
-            {"query": query, "summary": summary}
-        ).strip()
+        synthesis_with_links = self._linked_synthesis(state)
+        title = title.strip()
         if not title:
             title = "Research Summary"
 
@@ -63,17 +78,27 @@ class PublisherAgent:
         self.memory.write(query, "report_path", str(report_path))
         return {"report_path": str(report_path), "report_title": title}
 
+    def _linked_synthesis(self, state: dict[str, Any]) -> str:
+        query = state["query"]
+        synthesis = state.get("synthesis") or self.memory.read(query, "synthesis", "")
+        citations = state.get("citation_entries") or self.memory.read(
+            query, "citation_entries", []
+        )
+        return self._inject_citation_links(synthesis, citations)
+
     def _build_filename(self, title: str) -> str:
-        slug = re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")
+        slug = _SLUG_RE.sub("-", title.lower()).strip("-")
         if not slug:
             slug = "research-summary"
         slug = slug[:60].rstrip("-")
-        candidate = self.output_dir / f"{slug}.md"
+        with os.scandir(self.output_dir) as entries:
+            existing = {entry.name for entry in entries}
+        candidate = f"{slug}.md"
         counter = 2
-        while candidate.exists():
-            candidate = self.output_dir / f"{slug}-{counter}.md"
+        while candidate in existing:
+            candidate = f"{slug}-{counter}.md"
             counter += 1
-        return candidate.name
+        return candidate
 
     def _build_markdown(self, title: str, query: str, synthesis: str) -> str:
         body = synthesis.strip() or "_No synthesis available._"
@@ -88,19 +113,24 @@ class PublisherAgent:
     ) -> str:
         if not synthesis or not citations:
             return synthesis
-        url_map = {
-            int(entry.get("id", 0)): entry.get("url", "").strip()
-            for entry in citations
-            if entry.get("id") and entry.get("url")
-        }
-        if not url_map:
+        replacements: dict[int, str] = {}
+        for entry in citations:
+            citation_id, url = entry.get("id"), entry.get("url", "").strip()
+            if citation_id and url:
+                replacements[int(citation_id)] = f"[{int(citation_id)}](<{url}>)"
+        if not replacements:
             return synthesis
 
-        def replacer(match: re.Match[str]) -> str:
-            citation_id = int(match.group(1))
-            url = url_map.get(citation_id)
-            if not url:
-                return match.group(0)
-            return f"[{citation_id}](<{url}>)"
-
-        return re.sub(r"\[([0-9]+)\](?!\()", replacer, synthesis)
+        parts: list[str] = []
+        last = 0
+        for match in _CITATION_RE.finditer(synthesis):
+            replacement = replacements.get(int(match.group(1)))
+            if replacement is None:
+                continue
+            parts.append(synthesis[last : match.start()])
+            parts.append(replacement)
+            last = match.end()
+        if not parts:
+            return synthesis
+        parts.append(synthesis[last:])
+        return "".join(parts)
@@ -1,18 +1,64 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import itertools
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import re
 from typing import Any, Iterable
 
+import orjson
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import Runnable
 
+from ..cache import SemanticCache
 from ..memory import MemoryStore
+from .base import BaseAgent, run_in_background, run_sync
 from ..tools import SearchClient
 
 
-class ResearcherAgent:
+_JSON_RE = re.compile(r"\{.*\}", re.S)
+_DEFAULT_SYSTEM_PROMPT = (
+    "You are a research specialist. Given source snippets, craft a concise factual summary "
+    "highlighting key findings, data points, and differing perspectives."
+)
+_DEFAULT_USER_PROMPT = (
+    "Topic: {topic}\n"
+    "Sources:\n{sources}\n"
+    "Write a structured summary (3-5 sentences) citing sources inline as [1], [2], etc."
+)
+_BATCH_USER_PROMPT = (
+    "Handle each of the following {count} requests independently.\n\n"
+    "{requests}\n\n"
+    'Return one JSON object {{"drafts": [...]}} with an entry per request, in the order given. '
+    'Each entry follows the JSON schema, with "subtopic" set to the request\'s topic.'
+)
+
+
+def _parse_json_object(text: str) -> Any | None:
+    # Outermost {...} so markdown fences or stray prose around the payload are ignored.
+    match = _JSON_RE.search(text)
+    if match is None:
+        return None
+    try:
+        return orjson.loads(match.group(0))
+    except orjson.JSONDecodeError:
+        return None
+
+
+def build_citation_entries(drafts: dict[str, dict[str, Any]]) -> list[dict[str, Any]]:
+    titles: dict[str, str] = {}
+    for payload in drafts.values():
+        for source in payload.get("sources", []):
+            url = source.get("url", "").strip()
+            if url and url not in titles:
+                titles[url] = source.get("title", "").strip() or "Untitled"
+    return [
+        {"id": idx, "title": title, "url": url}
+        for idx, (url, title) in enumerate(titles.items(), start=1)
+    ]
+
+
+class ResearcherAgent(BaseAgent):
     """Single specialist responsible for drafting notes on assigned subtopics."""
 
     def __init__(
@@ -24,87 +70,335 @@ class ResearcherAgent:
         batch_size: int = 3,
         system_prompt: str | None = None,
         user_prompt: str | None = None,
+        role_prompt: str | None = None,
+        cache_system_prompt: bool = False,
+        enable_tracing: bool = False,
+        semantic_cache: SemanticCache | None = None,
+        max_batch_chars: int = 24_000,
+        stream_json: bool = False,
+        max_tokens: int | None = None,
     ) -> None:
         self.name = name
         self.llm = llm
         self.search_client = search_client
         self.batch_size = batch_size
-        system_msg = system_prompt or (
-            "You are a research specialist. Given source snippets, craft a concise factual summary "
-            "highlighting key findings, data points, and differing perspectives."
-        )
-        user_msg = user_prompt or (
-            "Topic: {topic}\n"
-            "Sources:\n{sources}\n"
-            "Write a structured summary (3-5 sentences) citing sources inline as [1], [2], etc."
-        )
-        self.prompt = ChatPromptTemplate.from_messages(
-            [
-                ("system", system_msg),
-                ("user", user_msg),
-            ]
+        self.semantic_cache = semantic_cache
+        self.max_batch_chars = max_batch_chars
+        self.stream_json = stream_json
+        self.max_tokens = max_tokens
+        # Drafts are one JSON object; a run of blank lines means the model has moved on.
+        self.call_kwargs: dict[str, Any] = (
+            {"max_tokens": max_tokens, "stop": ["\n\n\n"]} if max_tokens else {}
         )
+        self.cache_system_prompt = cache_system_prompt
+        self.run_config = self._run_config(enable_tracing)
+        system_parts = (system_prompt or _DEFAULT_SYSTEM_PROMPT,)
+        if role_prompt:
+            system_parts += (role_prompt,)
+        self.user_prompt = user_prompt or _DEFAULT_USER_PROMPT
+        self.prompt = self._build_prompt(self.user_prompt, *system_parts)
+        self.batch_prompt = self._build_prompt(_BATCH_USER_PROMPT, *system_parts)
         self.parser = StrOutputParser()
+        self.chain = self.prompt | self._bound_llm() | self.parser
+
+    def __call__(self, state: dict[str, Any]) -> dict[str, Any]:
+        return run_sync(self._research(state))
+
+    async def acall(self, state: dict[str, Any]) -> dict[str, Any]:
+        return await run_in_background(self._research(state))
+
+    async def _research(self, state: dict[str, Any]) -> dict[str, Any]:
+        query = state["query"]
+        subtopics = list(dict.fromkeys(state.get("subtopics", [])))
+        results = await asyncio.gather(
+            *(self.aresearch_topic(topic, query=query) for topic in subtopics),
+            return_exceptions=True,
+        )
+        drafts: dict[str, dict[str, Any]] = {}
+        for topic, result in zip(subtopics, results):
+            if isinstance(result, BaseException):
+                raise result
+            drafts[topic] = {**result, "topic": topic}
+        return {"drafts": drafts, "citation_entries": build_citation_entries(drafts)}
 
     def research_topic(self, topic: str, *, query: str) -> dict[str, Any]:
+        if cached := self._cached_research(topic):
+            return cached
         sources = self.search_client.search(topic, k=self.batch_size)
-        formatted_sources = self._format_sources(sources)
-        summary = (self.prompt | self.llm | self.parser).invoke(
-            {"topic": topic, "sources": formatted_sources}
+        summary = self.chain.invoke(self.prompt_inputs(topic, sources), config=self.run_config)
+        payload = {"summary": summary, "sources": sources, "agent": self.name}
+        self._cache_research(topic, payload)
+        return payload
+
+    async def aresearch_topic(
+        self,
+        topic: str,
+        *,
+        query: str,
+        limiter: asyncio.Semaphore | None = None,
+        sources: list[dict[str, str]] | None = None,
+    ) -> dict[str, Any]:
+        if cached := await self._acached_research(topic):
+            return cached
+        if sources is None:
+            sources = await self.search_client.asearch(topic, k=self.batch_size)
+        async with limiter or contextlib.nullcontext():
+            if self.stream_json:
+                summary = await self._astream_json(self.prompt_inputs(topic, sources))
+            else:
+                summary = await self.chain.ainvoke(
+                    self.prompt_inputs(topic, sources), config=self.run_config
+                )
+        payload = {"summary": summary, "sources": sources, "agent": self.name}
+        await self._acache_research(topic, payload)
+        return payload
+
+    async def aresearch_batch(
+        self,
+        topics: list[str],
+        *,
+        query: str,
+        limiter: asyncio.Semaphore | None = None,
+    ) -> list[dict[str, Any]]:
+        results: dict[str, dict[str, Any]] = {}
+        pending: list[str] = []
+        hits = await asyncio.gather(*(self._acached_research(topic) for topic in topics))
+        for topic, cached in zip(topics, hits):
+            if cached:
+                results[topic] = cached
+            else:
+                pending.append(topic)
+
+        found = await asyncio.gather(
+            *(self.search_client.asearch(topic, k=self.batch_size) for topic in pending)
+        )
+        sources_by_topic = dict(zip(pending, found))
+        if len(pending) > 1:
+            inputs = self.batch_prompt_inputs(pending, found)
+            # Oversized batches would overflow the context window; draft those one at a time.
+            if len(inputs["requests"]) <= self.max_batch_chars:
+                # The output budget covers one draft per subtopic in the batch.
+                chain = self.batch_prompt | self._bound_llm(len(pending)) | self.parser
+                async with limiter or contextlib.nullcontext():
+                    raw = await chain.ainvoke(inputs, config=self.run_config)
+                for topic, summary in zip(pending, self._split_batch(raw, pending)):
+                    if summary is not None:
+                        results[topic] = {
+                            "summary": summary,
+                            "sources": sources_by_topic[topic],
+                            "agent": self.name,
+                        }
+                await asyncio.gather(
+                    *(
+                        self._acache_research(topic, results[topic])
+                        for topic in pending
+                        if topic in results
+                    )
+                )
+                pending = [topic for topic in pending if topic not in results]
+
+        # Anything the batched reply skipped or mangled gets its own call.
+        drafted = await asyncio.gather(
+            *(
+                self.aresearch_topic(
+                    topic, query=query, limiter=limiter, sources=sources_by_topic[topic]
+                )
+                for topic in pending
+            )
         )
-        return {"summary": summary, "sources": sources, "agent": self.name}
+        results.update(zip(pending, drafted))
+        return [results[topic] for topic in topics]
+
+    async def _astream_json(self, inputs: dict[str, Any]) -> str:
+        # Stop reading (and let the server stop decoding) once the outer JSON object closes,
+        # so trailing prose or a second copy of the schema is never generated in full.
+        parts: list[str] = []
+        depth = 0
+        in_string = escaped = False
+        async with contextlib.aclosing(
+            self.chain.astream(inputs, config=self.run_config)
+        ) as stream:
+            async for chunk in stream:
+                for idx, char in enumerate(chunk):
+                    if in_string:
+                        if escaped:
+                            escaped = False
+                        elif char == "\\":
+                            escaped = True
+                        elif char == '"':
+                            in_string = False
+                    elif char == '"' and depth:
+                        in_string = True
+                    elif char == "{":
+                        depth += 1
+                    elif char == "}" and depth:
+                        depth -= 1
+                        if not depth:
+                            parts.append(chunk[: idx + 1])
+                            return "".join(parts)
+                parts.append(chunk)
+        return "".join(parts)
+
+    def _bound_llm(self, drafts: int = 1) -> Runnable:
+        if not self.call_kwargs:
+            return self.llm
+        return self.llm.bind(**{**self.call_kwargs, "max_tokens": self.max_tokens * drafts})
+
+    def prompt_inputs(self, topic: str, sources: list[dict[str, str]]) -> dict[str, Any]:
+        return {"topic": topic, "sources": self._format_sources(sources)}
+
+    def batch_prompt_inputs(
+        self, topics: list[str], sources: list[list[dict[str, str]]]
+    ) -> dict[str, Any]:
+        requests = "\n\n".join(
+            f"### Request {idx}\n" + self.user_prompt.format(**self.prompt_inputs(topic, found))
+            for idx, (topic, found) in enumerate(zip(topics, sources), start=1)
+        )
+        return {"count": len(topics), "requests": requests}
+
+    def _split_batch(self, raw: str, topics: list[str]) -> list[str | None]:
+        data = _parse_json_object(raw)
+        drafts = data.get("drafts") if isinstance(data, dict) else None
+        if not isinstance(drafts, list):
+            return [None] * len(topics)
+        by_topic = {
+            entry.get("subtopic"): entry for entry in drafts if isinstance(entry, dict)
+        }
+        entries: list[Any] = [by_topic.get(topic) for topic in topics]
+        if None in entries and len(drafts) == len(topics):
+            # The model reworded the subtopics but kept the order.
+            entries = drafts
+        return [
+            orjson.dumps(entry).decode() if isinstance(entry, dict) else None
+            for entry in entries
+        ]
+
+    def _cached_research(self, topic: str) -> dict[str, Any] | None:
+        if self.semantic_cache is None:
+            return None
+        return self.semantic_cache.lookup(topic, scope=self._cache_scope())
+
+    def _cache_research(self, topic: str, payload: dict[str, Any]) -> None:
+        # Drafts written against the "not configured" placeholder must not outlive it.
+        if self.semantic_cache is not None and self.search_client.configured:
+            self.semantic_cache.store(topic, payload, scope=self._cache_scope())
+
+    async def _acached_research(self, topic: str) -> dict[str, Any] | None:
+        if self.semantic_cache is None:
+            return None
+        return await self.semantic_cache.alookup(topic, scope=self._cache_scope())
+
+    async def _acache_research(self, topic: str, payload: dict[str, Any]) -> None:
+        if self.semantic_cache is not None and self.search_client.configured:
+            await self.semantic_cache.astore(topic, payload, scope=self._cache_scope())
+
+    def _cache_scope(self) -> str:
+        return f"research:{self.search_client.provider}:{self.name}"
 
     def _format_sources(self, sources: list[dict[str, str]]) -> str:
-        formatted = []
-        for idx, source in enumerate(sources, start=1):
-            title = source.get("title", "Untitled")
-            url = source.get("url", "")
-            snippet = source.get("snippet", "")
-            formatted.append(f"[{idx}] {title}\nURL: {url}\n{snippet}")
-        return "\n\n".join(formatted) if formatted else "No sources found."
+        if not sources:
+            return "No sources found."
+        return "\n\n".join(
+            f"[{idx}] {source.get('title', 'Untitled')}\n"
+            f"URL: {source.get('url', '')}\n"
+            f"{source.get('snippet', '')}"
+            for idx, source in enumerate(sources, start=1)
+        )
 
 
 class ResearchTeamAgent:
     """Coordinates multiple research specialists and merges their work."""
 
-    def __init__(self, members: Iterable[ResearcherAgent], memory: MemoryStore) -> None:
+    def __init__(
+        self,
+        members: Iterable[ResearcherAgent],
+        memory: MemoryStore,
+        *,
+        max_concurrency: int | None = None,
+        batch_subtopics: bool = False,
+    ) -> None:
         self.members = list(members)
         if not self.members:
             raise ValueError("ResearchTeamAgent requires at least one researcher.")
         self.memory = memory
+        self.max_concurrency = max_concurrency
+        self.batch_subtopics = batch_subtopics
 
     def __call__(self, state: dict[str, Any]) -> dict[str, Any]:
+        return run_sync(self._research(state))
+
+    async def acall(self, state: dict[str, Any]) -> dict[str, Any]:
+        # The members' cached LLM clients must only be driven from the shared background loop.
+        return await run_in_background(self._research(state))
+
+    async def _research(self, state: dict[str, Any]) -> dict[str, Any]:
         query = state["query"]
-        subtopics = list(state.get("subtopics", []))
+        subtopics = list(dict.fromkeys(state.get("subtopics", [])))
         if not subtopics:
-            self.memory.write(query, "drafts", {})
-            return {"drafts": {}}
+            return await self._arecord_drafts(query, [], [])
+
+        # Keep in-flight LLM calls within what the serving backend batches efficiently.
+        limiter = asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+        if self.batch_subtopics:
+            return await self._arecord_drafts(
+                query, subtopics, await self._research_batched(query, subtopics, limiter)
+            )
+
+        async def run_research(topic: str, researcher: ResearcherAgent) -> dict[str, Any]:
+            payload = await researcher.aresearch_topic(topic, query=query, limiter=limiter)
+            return {**payload, "topic": topic}
+
+        results = await asyncio.gather(
+            *(run_research(topic, member) for topic, member in self.assign(subtopics))
+        )
+        return await self._arecord_drafts(query, subtopics, results)
+
+    async def _research_batched(
+        self,
+        query: str,
+        subtopics: list[str],
+        limiter: asyncio.Semaphore | None,
+    ) -> list[dict[str, Any]]:
+        # One prompt per member covering all of its subtopics, so the shared prefix is paid once.
+        groups: dict[str, tuple[ResearcherAgent, list[str]]] = {}
+        for topic, member in self.assign(subtopics):
+            groups.setdefault(member.name, (member, []))[1].append(topic)
+        batches = await asyncio.gather(
+            *(
+                member.aresearch_batch(topics, query=query, limiter=limiter)
+                for member, topics in groups.values()
+            )
+        )
+        by_topic = {
+            topic: {**payload, "topic": topic}
+            for (_, topics), payloads in zip(groups.values(), batches)
+            for topic, payload in zip(topics, payloads)
+        }
+        return [by_topic[topic] for topic in subtopics]
+
+    async def _arecord_drafts(
+        self, query: str, subtopics: list[str], payloads: list[dict[str, Any]]
+    ) -> dict[str, Any]:
+        # The background loop carries every concurrent run's fan-out; a synchronous Redis
+        # write on it would stall them all.
+        return await asyncio.to_thread(self.record_drafts, query, subtopics, payloads)
+
+    def assign(self, subtopics: list[str]) -> list[tuple[str, ResearcherAgent]]:
+        # Drafts are keyed by subtopic, so a repeated planner line would only be researched
+        # twice and then overwritten; each distinct subtopic goes to exactly one member.
+        return list(zip(dict.fromkeys(subtopics), itertools.cycle(self.members)))
 
+    def record_drafts(
+        self, query: str, subtopics: list[str], payloads: list[dict[str, Any]]
+    ) -> dict[str, Any]:
         drafts: dict[str, dict[str, Any]] = {}
-        ordered_results: list[tuple[str, dict[str, Any]] | None] = [None] * len(subtopics)
-        member_cycle = itertools.cycle(self.members)
-
-        def run_research(idx: int, topic: str, researcher: ResearcherAgent) -> tuple[int, str, dict[str, Any]]:
-            payload = researcher.research_topic(topic, query=query)
-            payload = {**payload, "topic": topic}
-            return idx, topic, payload
-
-        worker_count = min(len(self.members), len(subtopics))
-        with ThreadPoolExecutor(max_workers=worker_count) as executor:
-            futures = [
-                executor.submit(run_research, idx, topic, next(member_cycle))
-                for idx, topic in enumerate(subtopics, start=1)
-            ]
-            for future in as_completed(futures):
-                idx, topic, payload = future.result()
-                ordered_results[idx - 1] = (topic, payload)
-
-        for idx, result in enumerate(ordered_results, start=1):
-            if result is None:
-                continue
-            topic, payload = result
+        entries: dict[str, Any] = {}
+        for idx, (topic, payload) in enumerate(zip(subtopics, payloads), start=1):
             drafts[topic] = payload
-            self.memory.write(query, f"research:{idx}", payload)
+            entries[f"research:{idx}"] = payload
 
-        self.memory.write(query, "drafts", drafts)
-        return {"drafts": drafts}
+        citation_entries = build_citation_entries(drafts)
+        entries["drafts"] = drafts
+        entries["citation_entries"] = citation_entries
+        self.memory.write_many(query, entries)
+        return {"drafts": drafts, "citation_entries": citation_entries}
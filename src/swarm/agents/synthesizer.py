@@ -1,16 +1,33 @@
 from __future__ import annotations
 
-import json
-from typing import Any, Literal
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Literal
 
+import orjson
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import Runnable
 
 from ..memory import MemoryStore
+from .base import BaseAgent
+from .researcher import build_citation_entries
 
 
-class SynthesizerAgent:
+_TITLE_PREFIX_CHARS = 500
+_SYSTEM_PROMPT = (
+    "You are a lead analyst. Merge the researcher summaries into a unified deliverable. "
+    "Highlight consensus, disagreements, and notable data with citations."
+)
+_USER_PROMPT = (
+    "Original question: {query}\n"
+    "Research notes:\n{notes}\n"
+    "Citation map (use these ids for inline references):\n{citation_map}\n"
+    "Craft a comprehensive yet digestible synthesis. Include an executive summary, "
+    "key insights, and opportunities for further investigation. Append bracketed citation ids "
+    "immediately after every sentence that draws on sourced information, using only ids from the map."
+)
+
+
+class SynthesizerAgent(BaseAgent):
     """Combines researcher notes into a cohesive narrative."""
 
     def __init__(
@@ -18,72 +35,90 @@ class SynthesizerAgent:
         llm: Runnable,
         memory: MemoryStore,
         enable_evaluator: bool = False,
+        *,
+        cache_system_prompt: bool = False,
+        enable_tracing: bool = False,
+        title_generator: Callable[[dict[str, Any]], str] | None = None,
     ) -> None:
         self.llm = llm
         self.memory = memory
+        self.cache_system_prompt = cache_system_prompt
+        self.run_config = self._run_config(enable_tracing)
         self.enable_evaluator = enable_evaluator
-        self.prompt = ChatPromptTemplate.from_messages(
-            [
-                (
-                    "system",
-                    "You are a lead analyst. Merge the researcher summaries into a unified deliverable. "
-                    "Highlight consensus, disagreements, and notable data with citations.",
-                ),
-                (
-                    "user",
-                    "Original question: {query}\n"
-                    "Research notes:\n{notes}\n"
-                    "Citation map (use these ids for inline references):\n{citation_map}\n"
-                    "Craft a comprehensive yet digestible synthesis. Include an executive summary, "
-                    "key insights, and opportunities for further investigation. Append bracketed citation ids "
-                    "immediately after every sentence that draws on sourced information, using only ids from the map.",
-                ),
-            ]
-        )
+        self.title_generator = title_generator
+        self.prompt = self._build_prompt(_USER_PROMPT, _SYSTEM_PROMPT)
         self.parser = StrOutputParser()
+        self.chain = self.prompt | self.llm | self.parser
 
     def __call__(self, state: dict[str, Any]) -> dict[str, Any]:
+        if self.title_generator is None:
+            synthesis = self.chain.invoke(self.prompt_inputs(state), config=self.run_config)
+            return self.apply_output(state, synthesis)
+        return self._stream_with_title(state)
+
+    def _stream_with_title(self, state: dict[str, Any]) -> dict[str, Any]:
+        # The title only needs the opening of the synthesis, so request it while the rest streams.
+        citation_entries = self._citation_entries(state)
+        chunks: list[str] = []
+        streamed = 0
+        title_future: Future[str] | None = None
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            for chunk in self.chain.stream(self.prompt_inputs(state), config=self.run_config):
+                chunks.append(chunk)
+                streamed += len(chunk)
+                if title_future is None and streamed >= _TITLE_PREFIX_CHARS:
+                    partial_state = {
+                        **state,
+                        "synthesis": "".join(chunks),
+                        "citation_entries": citation_entries,
+                    }
+                    title_future = executor.submit(self.title_generator, partial_state)
+            state_update = self.apply_output(state, "".join(chunks))
+            if title_future is not None:
+                state_update["report_title"] = title_future.result()
+        return state_update
+
+    def prompt_inputs(self, state: dict[str, Any]) -> dict[str, Any]:
         query = state["query"]
-        drafts: dict[str, dict[str, Any]] = state.get("drafts") or self.memory.read(
-            query, "drafts", {}
-        )
+        drafts = self._drafts(state)
         notes = self._format_notes(drafts)
-        citation_entries = self._build_citation_entries(drafts)
-        citation_map = json.dumps(citation_entries, ensure_ascii=False, indent=2) if citation_entries else "[]"
-        synthesis = (self.prompt | self.llm | self.parser).invoke(
-            {"query": query, "notes": notes, "citation_map": citation_map}
-        )
+        citation_entries = self._citation_entries(state)
+        citation_map = orjson.dumps(citation_entries, option=orjson.OPT_INDENT_2).decode() if citation_entries else "[]"
+        return {"query": query, "notes": notes, "citation_map": citation_map}
+
+    def apply_output(self, state: dict[str, Any], synthesis: str) -> dict[str, Any]:
+        query = state["query"]
         self.memory.write(query, "synthesis", synthesis)
-        if citation_entries:
-            self.memory.write(query, "citation_entries", citation_entries)
         state_update: dict[str, Any] = {"synthesis": synthesis}
-        if citation_entries:
-            state_update["citation_entries"] = citation_entries
+        if state.get("citation_entries") is None:
+            citation_entries = self._citation_entries(state)
+            if citation_entries:
+                self.memory.write(query, "citation_entries", citation_entries)
+                state_update["citation_entries"] = citation_entries
         return state_update
 
-    def needs_evaluation(self, _: dict[str, Any]) -> Literal["evaluate", "publish"]:
-        return "evaluate" if self.enable_evaluator else "publish"
+    def needs_evaluation(
+        self, _: dict[str, Any]
+    ) -> Literal["publish_prep"] | list[Literal["evaluate", "publish_prep"]]:
+        # Critique and title generation do not read each other's output, so run them side by side.
+        return ["evaluate", "publish_prep"] if self.enable_evaluator else "publish_prep"
+
+    def _drafts(self, state: dict[str, Any]) -> dict[str, dict[str, Any]]:
+        return state.get("drafts") or self.memory.read(state["query"], "drafts", {})
+
+    def _citation_entries(self, state: dict[str, Any]) -> list[dict[str, Any]]:
+        # The research stage normally builds these; recompute only for drafts from elsewhere.
+        entries = state.get("citation_entries")
+        if entries is None:
+            entries = self.memory.read(state["query"], "citation_entries")
+        if entries is None:
+            entries = build_citation_entries(self._drafts(state))
+        return entries
 
     def _format_notes(self, drafts: dict[str, dict[str, Any]]) -> str:
         if not drafts:
             return "No research drafts available."
-        lines: list[str] = []
-        for idx, (topic, payload) in enumerate(drafts.items(), start=1):
-            summary = payload.get("summary", "")
-            lines.append(f"{idx}. {topic}\n{summary}")
-        return "\n\n".join(lines)
-
-    def _build_citation_entries(self, drafts: dict[str, dict[str, Any]]) -> list[dict[str, str]]:
-        entries: list[dict[str, str]] = []
-        seen_urls: set[str] = set()
-        counter = 1
-        for payload in drafts.values():
-            for source in payload.get("sources", []):
-                url = source.get("url", "").strip()
-                title = source.get("title", "").strip() or "Untitled"
-                if not url or url in seen_urls:
-                    continue
-                entries.append({"id": counter, "title": title, "url": url})
-                seen_urls.add(url)
-                counter += 1
-        return entries
+        return "\n\n".join(
+            f"{idx}. {topic}\n{payload.get('summary', '')}"
+            for idx, (topic, payload) in enumerate(drafts.items(), start=1)
+        )
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import itertools
+import json
+import time
+from concurrent.futures import Future
+from typing import Any
+
+from langchain_core.messages import BaseMessage
+
+
+_ROLES = {"system": "system", "human": "user", "ai": "assistant"}
+_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class BatchRunner:
+    """Queues agent prompts and resolves them through the OpenAI Batch API."""
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        poll_interval: float = 30.0,
+        completion_window: str = "24h",
+    ) -> None:
+        self.client = client
+        self.poll_interval = poll_interval
+        self.completion_window = completion_window
+        self._ids = itertools.count(1)
+        self._pending: list[tuple[str, dict[str, Any], Future[str]]] = []
+
+    def submit(self, agent: Any, payload: dict[str, Any]) -> Future[str]:
+        messages = agent.prompt.format_messages(**payload)
+        body = {
+            "model": agent.llm.model_name,
+            "temperature": agent.llm.temperature,
+            "messages": [_to_openai_message(message) for message in messages],
+            **getattr(agent, "call_kwargs", {}),
+        }
+        future: Future[str] = Future()
+        self._pending.append((f"request-{next(self._ids)}", body, future))
+        return future
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": body,
+                },
+                ensure_ascii=False,
+            )
+            for custom_id, body, _ in pending
+        ]
+        try:
+            outputs = self._run_batch("\n".join(lines).encode("utf-8"))
+        except Exception as exc:
+            for _, _, future in pending:
+                future.set_exception(exc)
+            raise
+
+        for custom_id, _, future in pending:
+            record = outputs.get(custom_id)
+            response = (record or {}).get("response") or {}
+            if not record or record.get("error") or response.get("status_code") != 200:
+                error = (record or {}).get("error") or response.get("body")
+                future.set_exception(
+                    RuntimeError(f"Batch request {custom_id} failed: {error}")
+                )
+                continue
+            content = response["body"]["choices"][0]["message"].get("content") or ""
+            future.set_result(content)
+
+    def _run_batch(self, data: bytes) -> dict[str, dict[str, Any]]:
+        batch_file = self.client.files.create(file=("batch.jsonl", data), purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window=self.completion_window,
+        )
+        while batch.status not in _TERMINAL_STATUSES:
+            time.sleep(self.poll_interval)
+            batch = self.client.batches.retrieve(batch.id)
+
+        outputs: dict[str, dict[str, Any]] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if line.strip():
+                    record = json.loads(line)
+                    outputs[record["custom_id"]] = record
+        if batch.status != "completed" and not outputs:
+            raise RuntimeError(f"Batch {batch.id} finished with status {batch.status}")
+        return outputs
+
+
+def _to_openai_message(message: BaseMessage) -> dict[str, Any]:
+    content = message.content
+    if isinstance(content, list):
+        # Provider cache markers are not part of the OpenAI batch schema.
+        content = [
+            {"type": "text", "text": block["text"] if isinstance(block, dict) else block}
+            for block in content
+        ]
+    return {"role": _ROLES.get(message.type, message.type), "content": content}
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any
+
+from .memory import MemoryStore
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore
+
+try:
+    from fastembed import TextEmbedding
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    TextEmbedding = None  # type: ignore
+
+
+class SemanticCache:
+    """Returns stored payloads for texts whose embeddings closely match a previous key."""
+
+    def __init__(
+        self,
+        memory: MemoryStore,
+        *,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        threshold: float = 0.92,
+        max_entries: int = 256,
+    ) -> None:
+        if np is None or TextEmbedding is None:
+            raise ImportError("numpy and fastembed are required for the semantic cache.")
+        self.memory = memory
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._model = TextEmbedding(model_name=model_name)
+        self._embed = lru_cache(maxsize=1024)(self._embed_uncached)
+        self._entries: dict[str, OrderedDict[str, tuple[Any, Any]]] = {}
+        self._matrices: dict[str, tuple[list[str], Any]] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, text: str, *, scope: str = "") -> Any | None:
+        vector = self._embed(text)
+        with self._lock:
+            entries = self._load(scope)
+            if not entries:
+                return None
+            keys, matrix = self._matrix(scope, entries)
+            scores = matrix @ vector
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            key = keys[best]
+            entries.move_to_end(key)
+            return entries[key][1]
+
+    async def alookup(self, text: str, *, scope: str = "") -> Any | None:
+        # Embedding inference and Redis I/O block; async callers run them on a worker thread.
+        return await asyncio.to_thread(self.lookup, text, scope=scope)
+
+    async def astore(self, text: str, payload: Any, *, scope: str = "") -> None:
+        await asyncio.to_thread(self.store, text, payload, scope=scope)
+
+    def store(self, text: str, payload: Any, *, scope: str = "") -> None:
+        vector = self._embed(text)
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        with self._lock:
+            entries = self._load(scope)
+            entries[key] = (vector, payload)
+            entries.move_to_end(key)
+            self.memory.write_vector(scope, key, vector.tolist(), payload)
+            while len(entries) > self.max_entries:
+                evicted, _ = entries.popitem(last=False)
+                self.memory.delete_vector(scope, evicted)
+            self._matrices.pop(scope, None)
+
+    def _embed_uncached(self, text: str) -> Any:
+        vector = np.asarray(next(iter(self._model.embed([text]))), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _load(self, scope: str) -> OrderedDict[str, tuple[Any, Any]]:
+        entries = self._entries.get(scope)
+        if entries is None:
+            entries = OrderedDict(
+                (key, (np.asarray(vector, dtype=np.float32), payload))
+                for key, vector, payload in self.memory.scan_vectors(scope)
+            )
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+            self._entries[scope] = entries
+        return entries
+
+    def _matrix(
+        self, scope: str, entries: OrderedDict[str, tuple[Any, Any]]
+    ) -> tuple[list[str], Any]:
+        cached = self._matrices.get(scope)
+        if cached is None:
+            keys = list(entries)
+            cached = (keys, np.stack([entries[key][0] for key in keys]))
+            self._matrices[scope] = cached
+        return cached
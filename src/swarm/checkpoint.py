@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+
+from langchain_core.runnables import RunnableConfig
+
+try:
+    from langgraph.checkpoint.sqlite import SqliteSaver
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    SqliteSaver = None  # type: ignore
+
+
+class CheckpointStore:
+    """SQLite-backed LangGraph checkpoints keyed by query, expired after a TTL."""
+
+    def __init__(self, path: str, *, ttl: float = 86400.0) -> None:
+        if SqliteSaver is None:
+            raise ImportError(
+                "langgraph-checkpoint-sqlite is required for checkpointing. "
+                "Install it with `pip install langgraph-checkpoint-sqlite`."
+            )
+        self.ttl = ttl
+        self.saver = SqliteSaver(sqlite3.connect(path, check_same_thread=False))
+        # swarm_threads gets its own connection so its commits can never land in the middle
+        # of a transaction the saver has open on its connection.
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS swarm_threads "
+                "(thread_id TEXT PRIMARY KEY, updated_at REAL NOT NULL)"
+            )
+
+    def config_for(self, query: str, *variant: str) -> RunnableConfig:
+        # Anything that changes the output (graph shape, search provider, models) is part of
+        # the key, so a run never resumes or reuses state produced under other settings.
+        key = "\0".join((query, *variant))
+        return {"configurable": {"thread_id": hashlib.sha1(key.encode("utf-8")).hexdigest()}}
+
+    def touch(self, thread_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO swarm_threads (thread_id, updated_at) VALUES (?, ?) "
+                "ON CONFLICT(thread_id) DO UPDATE SET updated_at = excluded.updated_at",
+                (thread_id, time.time()),
+            )
+
+    def sweep(self) -> int:
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT thread_id FROM swarm_threads WHERE updated_at < ?", (cutoff,)
+                )
+            ]
+        for thread_id in expired:
+            self.saver.delete_thread(thread_id)
+        if expired:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "DELETE FROM swarm_threads WHERE thread_id = ?",
+                    [(thread_id,) for thread_id in expired],
+                )
+        return len(expired)
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Literal
 
 from dotenv import load_dotenv
 
@@ -26,7 +28,27 @@ def _env_int(name: str, default: int) -> int:
         raise ValueError(f"Environment variable {name} must be an integer") from exc
 
 
-@dataclass(slots=True)
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError as exc:
+        raise ValueError(f"Environment variable {name} must be a number") from exc
+
+
+def _env_choice(name: str, default: str, choices: tuple[str, ...]) -> str:
+    raw = os.getenv(name)
+    if not raw:
+        return default
+    value = raw.strip().lower()
+    if value not in choices:
+        raise ValueError(f"Environment variable {name} must be one of: {', '.join(choices)}")
+    return value
+
+
+@dataclass(slots=True, frozen=True)
 class Settings:
     """Runtime configuration for the research swarm."""
 
@@ -35,13 +57,29 @@ class Settings:
     tavily_api_key: str | None = field(default=None)
     max_subtopics: int = field(default=5)
     researcher_batch_size: int = field(default=3)
+    researcher_concurrency: int = field(default=32)
+    researcher_batch_subtopics: bool = field(default=False)
+    researcher_stream_json: bool = field(default=False)
     researcher_4bit_model: str = field(default="qwen2.5-7b-instruct-q4")
     researcher_8bit_model: str = field(default="qwen2.5-7b-instruct-q8")
     synth_eval_model: str = field(default="qwen2.5-32b-instruct-q4")
     lm_studio_server: str | None = field(default=None)
+    researcher_server: str | None = field(default=None)
     enable_evaluator: bool = field(default=False)
+    prompt_cache_control: bool = field(default=False)
+    redis_url: str | None = field(default=None)
+    enable_semantic_cache: bool = field(default=False)
+    semantic_cache_threshold: float = field(default=0.92)
+    semantic_cache_size: int = field(default=256)
+    execution_mode: Literal["online", "batch"] = field(default="online")
+    enable_tracing: bool = field(default=False)
+    llm_cache: bool = field(default=False)
+    llm_cache_path: str = field(default=".swarm_llm_cache.db")
+    checkpoint_path: str | None = field(default=None)
+    checkpoint_ttl: float = field(default=86400.0)
 
     @classmethod
+    @lru_cache(maxsize=1)
     def from_env(cls) -> "Settings":
         return cls(
             openai_model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
@@ -49,12 +87,31 @@ class Settings:
             tavily_api_key=os.getenv("TAVILY_API_KEY"),
             max_subtopics=_env_int("MAX_SUBTOPICS", 5),
             researcher_batch_size=_env_int("RESEARCHER_BATCH_SIZE", 3),
+            researcher_concurrency=_env_int("RESEARCHER_CONCURRENCY", 32),
+            researcher_batch_subtopics=_env_flag("RESEARCHER_BATCH_SUBTOPICS", False),
+            researcher_stream_json=_env_flag("RESEARCHER_STREAM_JSON", False),
             researcher_4bit_model=os.getenv("RESEARCHER_4BIT_MODEL", "qwen2.5-7b-instruct-q4"),
             researcher_8bit_model=os.getenv("RESEARCHER_8BIT_MODEL", "qwen2.5-7b-instruct-q8"),
             synth_eval_model=os.getenv("SYNTH_EVAL_4BIT_MODEL", "qwen2.5-32b-instruct-q4"),
             lm_studio_server=os.getenv("LM_STUDIO_SERVER"),
+            researcher_server=os.getenv("RESEARCHER_SERVER"),
             enable_evaluator=_env_flag("ENABLE_EVALUATOR", False),
+            prompt_cache_control=_env_flag("PROMPT_CACHE_CONTROL", False),
+            redis_url=os.getenv("REDIS_URL"),
+            enable_semantic_cache=_env_flag("SEMANTIC_CACHE", False),
+            semantic_cache_threshold=_env_float("SEMANTIC_CACHE_THRESHOLD", 0.92),
+            semantic_cache_size=_env_int("SEMANTIC_CACHE_SIZE", 256),
+            execution_mode=_env_choice("EXECUTION_MODE", "online", ("online", "batch")),  # type: ignore[arg-type]
+            enable_tracing=_env_flag("ENABLE_TRACING", _env_flag("LANGCHAIN_TRACING_V2")),
+            llm_cache=_env_flag("SWARM_LLM_CACHE", False),
+            llm_cache_path=os.getenv("SWARM_LLM_CACHE_PATH", ".swarm_llm_cache.db"),
+            checkpoint_path=os.getenv("SWARM_CHECKPOINT_PATH"),
+            checkpoint_ttl=_env_float("SWARM_CHECKPOINT_TTL", 86400.0),
         )
 
 
 settings = Settings.from_env()
+
+if not settings.enable_tracing:
+    # LangChain attaches tracers from the environment; keep them off unless requested.
+    os.environ["LANGCHAIN_TRACING_V2"] = "false"
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-import json
-from typing import Any
+import hashlib
+from typing import Any, Iterator
+
+import orjson
 
 try:
     import redis
@@ -12,7 +14,7 @@ except ModuleNotFoundError:  # pragma: no cover - optional dependency
 class MemoryStore:
     """Simple shared memory store backed by Redis when available."""
 
-    def __init__(self, namespace: str = "research", redis_url: str | None = None) -> None:
+    def __init__(self, namespace: str = "research:v2", redis_url: str | None = None) -> None:
         self.namespace = namespace
         self._redis = None
         if redis_url and redis:
@@ -20,16 +22,31 @@ class MemoryStore:
         self._cache: dict[str, Any] = {}
 
     def _compose_key(self, query: str, name: str) -> str:
-        return f"{self.namespace}:{hash(query)}:{name}"
+        return f"{self._query_prefix(query)}{name}"
+
+    def _query_prefix(self, query: str) -> str:
+        # hash() is salted per process; a stable digest lets other processes reuse entries.
+        digest = hashlib.blake2b(query.encode("utf-8"), digest_size=16).hexdigest()
+        return f"{self.namespace}:{digest}:"
 
     def write(self, query: str, name: str, value: Any) -> None:
-        payload = json.dumps(value)
+        payload = orjson.dumps(value).decode()
         key = self._compose_key(query, name)
         if self._redis:
             self._redis.set(key, payload)
         else:
             self._cache[key] = payload
 
+    def write_many(self, query: str, items: dict[str, Any]) -> None:
+        if self._redis:
+            with self._redis.pipeline(transaction=False) as pipe:
+                for name, value in items.items():
+                    pipe.set(self._compose_key(query, name), orjson.dumps(value).decode())
+                pipe.execute()
+        else:
+            for name, value in items.items():
+                self._cache[self._compose_key(query, name)] = orjson.dumps(value).decode()
+
     def read(self, query: str, name: str, default: Any = None) -> Any:
         key = self._compose_key(query, name)
         payload: str | None
@@ -39,10 +56,43 @@ class MemoryStore:
             payload = self._cache.get(key)
         if payload is None:
             return default
-        return json.loads(payload)
+        return orjson.loads(payload)
+
+    def write_vector(self, bucket: str, key: str, vector: list[float], payload: Any) -> None:
+        record = orjson.dumps({"vector": vector, "payload": payload}).decode()
+        full_key = self._vector_key(bucket, key)
+        if self._redis:
+            self._redis.set(full_key, record)
+        else:
+            self._cache[full_key] = record
+
+    def delete_vector(self, bucket: str, key: str) -> None:
+        full_key = self._vector_key(bucket, key)
+        if self._redis:
+            self._redis.delete(full_key)
+        else:
+            self._cache.pop(full_key, None)
+
+    def scan_vectors(self, bucket: str) -> Iterator[tuple[str, list[float], Any]]:
+        prefix = self._vector_key(bucket, "")
+        if self._redis:
+            keys = list(self._redis.scan_iter(f"{prefix}*"))
+            records = zip(keys, self._redis.mget(keys)) if keys else ()
+        else:
+            records = [
+                (key, value) for key, value in self._cache.items() if key.startswith(prefix)
+            ]
+        for key, record in records:
+            if record is None:
+                continue
+            data = orjson.loads(record)
+            yield key[len(prefix) :], data["vector"], data["payload"]
+
+    def _vector_key(self, bucket: str, key: str) -> str:
+        return f"{self.namespace}:vectors:{bucket}:{key}"
 
     def clear(self, query: str) -> None:
-        prefix = f"{self.namespace}:{hash(query)}:"
+        prefix = self._query_prefix(query)
         if self._redis:
             keys = list(self._redis.scan_iter(f"{prefix}*"))
             if keys:
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Any
 
+from .cache import SemanticCache
+
 try:
     from langchain_community.utilities.tavily_search import TavilySearchAPIWrapper
 except ModuleNotFoundError:  # pragma: no cover - optional dependency
@@ -16,10 +19,13 @@ class SearchClient:
         provider: str = "tavily",
         api_key: str | None = None,
         default_k: int = 5,
+        semantic_cache: SemanticCache | None = None,
     ) -> None:
         self.provider = provider
         self.default_k = default_k
+        self.semantic_cache = semantic_cache
         self._wrapper: Any | None = None
+        self._inflight: dict[tuple[str, int], asyncio.Task[list[dict[str, str]]]] = {}
 
         if provider == "tavily":
             if TavilySearchAPIWrapper is None:
@@ -36,20 +42,70 @@ class SearchClient:
         else:
             raise ValueError(f"Unsupported search provider: {provider}")
 
+    @property
+    def configured(self) -> bool:
+        return self.provider != "noop" and self._wrapper is not None
+
     def search(self, query: str, k: int | None = None) -> list[dict[str, str]]:
-        if self.provider == "noop" or not self._wrapper:
-            return [
-                {
-                    "title": "Search provider not configured",
-                    "url": "",
-                    "snippet": (
-                        "No web search provider is configured. Configure TAVILY_API_KEY "
-                        "or supply a custom SearchClient."
-                    ),
-                }
-            ]
+        if not self.configured:
+            return self._unconfigured_results()
+        size = k or self.default_k
+        if cached := self._cached_results(query, size):
+            return cached
+        results = self._normalize(self._wrapper.results(query, max_results=size))
+        self._cache_results(query, size, results)
+        return results
+
+    async def asearch(self, query: str, k: int | None = None) -> list[dict[str, str]]:
+        if not self.configured:
+            return self._unconfigured_results()
         size = k or self.default_k
-        results = self._wrapper.results(query, max_results=size)
+        # Researchers that land on the same subtopic share one provider request.
+        key = (query, size)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._afetch(query, size))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one cancelled caller doesn't abort the request the others await.
+        return await asyncio.shield(task)
+
+    async def _afetch(self, query: str, size: int) -> list[dict[str, str]]:
+        scope = self._cache_scope(size)
+        if self.semantic_cache is not None and (
+            cached := await self.semantic_cache.alookup(query, scope=scope)
+        ):
+            return cached
+        results = self._normalize(await self._wrapper.results_async(query, max_results=size))
+        if self.semantic_cache is not None and results:
+            await self.semantic_cache.astore(query, results, scope=scope)
+        return results
+
+    def _cached_results(self, query: str, size: int) -> list[dict[str, str]] | None:
+        if self.semantic_cache is None:
+            return None
+        return self.semantic_cache.lookup(query, scope=self._cache_scope(size))
+
+    def _cache_results(self, query: str, size: int, results: list[dict[str, str]]) -> None:
+        if self.semantic_cache is not None and results:
+            self.semantic_cache.store(query, results, scope=self._cache_scope(size))
+
+    def _cache_scope(self, size: int) -> str:
+        return f"search:{self.provider}:{size}"
+
+    def _unconfigured_results(self) -> list[dict[str, str]]:
+        return [
+            {
+                "title": "Search provider not configured",
+                "url": "",
+                "snippet": (
+                    "No web search provider is configured. Configure TAVILY_API_KEY "
+                    "or supply a custom SearchClient."
+                ),
+            }
+        ]
+
+    def _normalize(self, results: list[dict[str, Any]]) -> list[dict[str, str]]:
         normalized: list[dict[str, str]] = []
         for item in results:
             normalized.append(
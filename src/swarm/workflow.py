@@ -1,10 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import importlib.util
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from textwrap import dedent
+from types import MappingProxyType
 from pathlib import Path
-from typing import Any, Literal, TypedDict
+from typing import Any, Callable, Literal, NamedTuple, TypedDict
 
+import httpx
+from langchain_core.caches import BaseCache
+from langchain_core.globals import set_llm_cache
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from langgraph.graph import END, StateGraph
 
 from .agents import (
@@ -15,17 +26,34 @@ from .agents import (
     SynthesizerAgent,
     PublisherAgent,
 )
+from .agents.base import run_sync
+from .batch import BatchRunner
+from .cache import SemanticCache
+from .checkpoint import CheckpointStore
 from .config import Settings, settings
 from .memory import MemoryStore
 from .tools import SearchClient
 
 try:
     from langchain_openai import ChatOpenAI
+    from openai import OpenAI
 except ModuleNotFoundError as exc:  # pragma: no cover
     raise ImportError(
         "langchain-openai is required. Install dependencies with `pip install -r requirements.txt`."
     ) from exc
 
+try:
+    import blake3
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    blake3 = None  # type: ignore
+
+try:
+    import xxhash
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    xxhash = None  # type: ignore
+
+_OUTPUT_DIR = Path(__file__).resolve().parent.parent
+
 BASE_SYSTEM = dedent(
     """You are a research agent. Follow these guardrails:
 • Ground every claim in the provided snippets only; never infer beyond them.
@@ -43,6 +71,114 @@ BASE_SYSTEM = dedent(
 )
 
 
+# Built once at import; profiles are read-only and resolve their model from Settings.
+_RESEARCHER_PROFILES: tuple[MappingProxyType[str, Any], ...] = (
+    # === Scouts (4-bit, breadth, low-noise, same temp) ===
+    MappingProxyType(
+        {
+            "name": "scout-alpha",
+            "model_setting": "researcher_4bit_model",
+            "temperature": 0.14,
+            "top_p": 0.95,
+            "max_tokens": 400,
+            "system_prompt": BASE_SYSTEM,
+            "role_prompt": "ROLE: Fast-turnaround evidence scout; prefer crisp, atomic facts.",
+            "user_prompt": dedent(
+                """\
+                Topic: {topic}
+
+                Sources:
+                {sources}
+                Task: Produce EXACTLY three short factual sentences, each with an inline citation [id].
+                Return the JSON schema only."""
+            ),
+        }
+    ),
+    MappingProxyType(
+        {
+            "name": "scout-beta",
+            "model_setting": "researcher_4bit_model",
+            "temperature": 0.14,
+            "top_p": 0.95,
+            "max_tokens": 400,
+            "system_prompt": BASE_SYSTEM,
+            "role_prompt": "ROLE: Coverage-focused scout; surface the biggest takeaways and divergent viewpoints.",
+            "user_prompt": dedent(
+                """\
+                Topic: {topic}
+
+                Sources:
+                {sources}
+                Task: Summarize the top findings in 3-5 sentences with inline citations [id].
+                Return the JSON schema only."""
+            ),
+        }
+    ),
+    MappingProxyType(
+        {
+            "name": "scout-gamma",
+            "model_setting": "researcher_4bit_model",
+            "temperature": 0.14,
+            "top_p": 0.95,
+            "max_tokens": 400,
+            "system_prompt": BASE_SYSTEM,
+            "role_prompt": "ROLE: Precision note-taker; prioritize numbers, dates, and named entities.",
+            "user_prompt": dedent(
+                """\
+                Topic: {topic}
+
+                Sources:
+                {sources}
+                Task: List 3-4 key facts emphasizing statistics/dates, with inline citations [id].
+                Return the JSON schema only."""
+            ),
+        }
+    ),
+
+    # === Heavies (8-bit, depth/verification, even lower temp) ===
+    MappingProxyType(
+        {
+            "name": "analyst-delta",
+            "model_setting": "researcher_8bit_model",
+            "temperature": 0.09,
+            "top_p": 0.90,
+            "max_tokens": 800,
+            "system_prompt": BASE_SYSTEM,
+            "role_prompt": "ROLE: Senior analyst; connect themes, call out contradictions, keep to evidence.",
+            "user_prompt": dedent(
+                """\
+                Topic: {topic}
+
+                Sources:
+                {sources}
+                Task: Write a cohesive mini-brief (4-6 sentences) that highlights agreements/conflicts.
+                Every sentence must have at least one inline citation [id]. Return the JSON schema only."""
+            ),
+        }
+    ),
+    MappingProxyType(
+        {
+            "name": "analyst-epsilon",
+            "model_setting": "researcher_8bit_model",
+            "temperature": 0.09,
+            "top_p": 0.90,
+            "max_tokens": 800,
+            "system_prompt": BASE_SYSTEM,
+            "role_prompt": "ROLE: Verification-minded analyst; separate well-supported facts from tentative items.",
+            "user_prompt": dedent(
+                """\
+                Topic: {topic}
+
+                Sources:
+                {sources}
+                Task: Produce a cautious summary (4-5 sentences) that labels uncertainties and grades reliability.
+                Cite each sentence with [id]. Return the JSON schema only."""
+            ),
+        }
+    ),
+)
+
+
 class ResearchState(TypedDict, total=False):
     query: str
     subtopics: list[str]
@@ -54,8 +190,16 @@ class ResearchState(TypedDict, total=False):
     report_title: str
 
 
-@dataclass(slots=True)
-class ResearchResult:
+# Copied shallowly per run; nodes return fresh containers rather than mutating these.
+_INITIAL_STATE: ResearchState = {
+    "subtopics": [],
+    "drafts": {},
+    "synthesis": "",
+    "critique": "",
+}
+
+
+class ResearchResult(NamedTuple):
     state: ResearchState
     memory: MemoryStore
     graph: Any
@@ -67,30 +211,58 @@ def build_research_graph(
     synthesizer: SynthesizerAgent,
     publisher: PublisherAgent,
     evaluator: EvaluatorAgent | None = None,
+    *,
+    checkpointer: Any | None = None,
+) -> Any:
+    if hasattr(researcher, "acall"):
+        # Expose the coroutine so graph.ainvoke awaits the fan-out instead of parking a thread.
+        research = RunnableLambda(researcher.__call__, afunc=researcher.acall)
+    else:
+        research = researcher
+    return _assemble_graph(
+        planner,
+        research,
+        synthesizer,
+        publisher.prepare,
+        publisher,
+        route=synthesizer.needs_evaluation,
+        evaluate=evaluator,
+        checkpointer=checkpointer,
+    )
+
+
+def _assemble_graph(
+    plan: Any,
+    research: Any,
+    synthesize: Any,
+    publish_prep: Any,
+    publish: Any,
+    *,
+    route: Callable[[ResearchState], Any],
+    evaluate: Any | None = None,
+    checkpointer: Any | None = None,
 ) -> Any:
     builder = StateGraph(ResearchState)
-    builder.add_node("plan", planner)
-    builder.add_node("research", researcher)
-    builder.add_node("synthesize", synthesizer)
-    builder.add_node("publish", publisher)
+    builder.add_node("plan", plan)
+    builder.add_node("research", research)
+    builder.add_node("synthesize", synthesize)
+    builder.add_node("publish_prep", publish_prep)
+    builder.add_node("publish", publish)
     builder.set_entry_point("plan")
     builder.add_edge("plan", "research")
     builder.add_edge("research", "synthesize")
 
-    if evaluator:
-        builder.add_node("evaluate", evaluator)
-        builder.add_conditional_edges(
-            "synthesize",
-            synthesizer.needs_evaluation,
-            {"evaluate": "evaluate", "publish": "publish"},
-        )
+    if evaluate is not None:
+        builder.add_node("evaluate", evaluate)
+        builder.add_conditional_edges("synthesize", route, ["evaluate", "publish_prep"])
         builder.add_edge("evaluate", "publish")
     else:
-        builder.add_edge("synthesize", "publish")
+        builder.add_edge("synthesize", "publish_prep")
 
+    builder.add_edge("publish_prep", "publish")
     builder.add_edge("publish", END)
 
-    return builder.compile()
+    return builder.compile(checkpointer=checkpointer)
 
 
 def run_research_workflow(
@@ -100,161 +272,477 @@ def run_research_workflow(
     search_provider: Literal["tavily", "noop"] = "tavily",
 ) -> ResearchResult:
     cfg = config or settings
-    memory = MemoryStore()
+    if cfg.execution_mode == "batch":
+        return run_research_workflow_batch(
+            [query], config=cfg, search_provider=search_provider
+        )[0]
+    memory, agents, state = _prepare_run(query, cfg, search_provider)
+    checkpoints = (
+        _get_checkpoints(cfg.checkpoint_path, cfg.checkpoint_ttl)
+        if cfg.checkpoint_path
+        else None
+    )
+    has_evaluator = agents.evaluator is not None
+    graph = _bind_agents(
+        _compiled_graph(has_evaluator, checkpoints.saver if checkpoints else None), agents
+    )
+    if checkpoints is None:
+        final_state = graph.invoke(state)
+    else:
+        checkpoints.sweep()
+        run_config = checkpoints.config_for(query, *_checkpoint_variant(cfg, agents))
+        final_state = _invoke_checkpointed(graph, state, run_config, checkpoints)
+    memory.write(query, "final_state", final_state)
+    return ResearchResult(state=final_state, memory=memory, graph=graph)
+
+
+async def arun_research_workflow(
+    query: str,
+    *,
+    config: Settings | None = None,
+    search_provider: Literal["tavily", "noop"] = "tavily",
+) -> ResearchResult:
+    cfg = config or settings
+    if cfg.execution_mode == "batch":
+        results = await asyncio.to_thread(
+            run_research_workflow_batch, [query], config=cfg, search_provider=search_provider
+        )
+        return results[0]
+    if cfg.checkpoint_path:
+        # SqliteSaver is synchronous; run the checkpointed path on a worker thread instead.
+        return await asyncio.to_thread(
+            run_research_workflow, query, config=cfg, search_provider=search_provider
+        )
+    memory, agents, state = _prepare_run(query, cfg, search_provider)
+    graph = _bind_agents(_compiled_graph(agents.evaluator is not None), agents)
+    final_state = await graph.ainvoke(state)
+    memory.write(query, "final_state", final_state)
+    return ResearchResult(state=final_state, memory=memory, graph=graph)
+
+
+def _invoke_checkpointed(
+    graph: Any,
+    state: ResearchState,
+    run_config: dict[str, Any],
+    checkpoints: CheckpointStore,
+) -> ResearchState:
+    snapshot = graph.get_state(run_config)
+    if not snapshot.next and snapshot.values:
+        # Served from a finished run; not refreshing its timestamp lets the TTL retire it.
+        return snapshot.values
+    # An earlier attempt that stopped mid-graph resumes after its last saved node.
+    graph_input = None if snapshot.next else state
+    try:
+        return graph.invoke(graph_input, config=run_config)
+    finally:
+        checkpoints.touch(run_config["configurable"]["thread_id"])
+
+
+def _checkpoint_variant(cfg: Settings, agents: _SwarmAgents) -> tuple[str, ...]:
+    return (
+        "evaluate" if agents.evaluator is not None else "direct",
+        agents.search_provider,
+        cfg.researcher_4bit_model,
+        cfg.researcher_8bit_model,
+        cfg.synth_eval_model,
+        cfg.lm_studio_server or "",
+        cfg.researcher_server or "",
+    )
+
+
+def _prepare_run(
+    query: str,
+    cfg: Settings,
+    search_provider: Literal["tavily", "noop"],
+) -> tuple[MemoryStore, _SwarmAgents, ResearchState]:
+    memory = MemoryStore(redis_url=cfg.redis_url)
+    agents = _build_agents(cfg, memory, search_provider)
+    state: ResearchState = {**_INITIAL_STATE, "query": query}
+    return memory, agents, state
+
+
+def run_research_workflow_batch(
+    topics: list[str],
+    *,
+    config: Settings | None = None,
+    search_provider: Literal["tavily", "noop"] = "tavily",
+) -> list[ResearchResult]:
+    """Run every topic stage by stage, submitting each stage's LLM calls as one batch."""
+    cfg = config or settings
+    memory = MemoryStore(redis_url=cfg.redis_url)
+    agents = _build_agents(cfg, memory, search_provider)
+    runner = BatchRunner(_create_batch_client(cfg))
+    states: list[ResearchState] = [{**_INITIAL_STATE, "query": query} for query in topics]
+
+    def run_stage(agent: Any, stage_states: list[ResearchState]) -> None:
+        futures = [runner.submit(agent, agent.prompt_inputs(state)) for state in stage_states]
+        runner.flush()
+        for state, future in zip(stage_states, futures):
+            state.update(agent.apply_output(state, future.result()))
+
+    run_stage(agents.planner, states)
+
+    team = agents.researcher
+    pending: list[tuple[ResearchState, list[tuple[str, ResearcherAgent, Any, Any]]]] = []
+    for state in states:
+        jobs = []
+        for topic, member in team.assign(state["subtopics"]):
+            sources = member.search_client.search(topic, k=member.batch_size)
+            future = runner.submit(member, member.prompt_inputs(topic, sources))
+            jobs.append((topic, member, sources, future))
+        pending.append((state, jobs))
+    runner.flush()
+    for state, jobs in pending:
+        payloads = [
+            {
+                "summary": future.result(),
+                "sources": sources,
+                "agent": member.name,
+                "topic": topic,
+            }
+            for topic, member, sources, future in jobs
+        ]
+        topics = [payload["topic"] for payload in payloads]
+        state.update(team.record_drafts(state["query"], topics, payloads))
+
+    run_stage(agents.synthesizer, states)
+
+    # Critique and title generation are independent, so they share one batch.
+    reviewers = [agent for agent in (agents.evaluator, agents.publisher) if agent]
+    review = [
+        (agent, state, runner.submit(agent, agent.prompt_inputs(state)))
+        for agent in reviewers
+        for state in states
+    ]
+    runner.flush()
+    for agent, state, future in review:
+        state.update(agent.apply_output(state, future.result()))
+
+    results: list[ResearchResult] = []
+    for state in states:
+        memory.write(state["query"], "final_state", state)
+        results.append(ResearchResult(state=state, memory=memory, graph=None))
+    return results
+
+
+@dataclass(slots=True)
+class _SwarmAgents:
+    planner: PlannerAgent
+    researcher: ResearchTeamAgent
+    synthesizer: SynthesizerAgent
+    publisher: PublisherAgent
+    evaluator: EvaluatorAgent | None
+    search_provider: str
+
+
+# Key under which a run's agents ride in the graph config. The leading underscores keep the
+# (unserializable) agents out of checkpoint and trace metadata.
+_AGENTS_KEY = "__swarm_agents"
+
+
+@lru_cache(maxsize=None)
+def _compiled_graph(has_evaluator: bool, checkpointer: Any | None = None) -> Any:
+    # Structure depends only on whether the evaluator exists, so compile each shape once.
+    return _assemble_graph(
+        _dispatch("planner"),
+        RunnableLambda(_dispatch("researcher"), afunc=_aresearch),
+        _dispatch("synthesizer"),
+        _dispatch("publisher", "prepare"),
+        _dispatch("publisher"),
+        route=_dispatch("synthesizer", "needs_evaluation"),
+        evaluate=_dispatch("evaluator") if has_evaluator else None,
+        checkpointer=checkpointer,
+    )
+
+
+def _bind_agents(graph: Any, agents: _SwarmAgents) -> Any:
+    # A config-bound copy of the cached graph: every entry point (invoke, stream, batch,
+    # astream_events, ...) hands the agents to the dispatch nodes, with no recompilation.
+    return graph.with_config({"configurable": {_AGENTS_KEY: agents}})
+
+
+def _dispatch(role: str, method: str = "__call__") -> Callable[..., Any]:
+    def node(state: ResearchState, config: RunnableConfig) -> Any:
+        return getattr(getattr(config["configurable"][_AGENTS_KEY], role), method)(state)
+
+    node.__name__ = f"{role}_{method.strip('_')}"
+    return node
+
+
+async def _aresearch(state: ResearchState, config: RunnableConfig) -> dict[str, Any]:
+    return await config["configurable"][_AGENTS_KEY].researcher.acall(state)
+
+
+def _build_agents(
+    cfg: Settings,
+    memory: MemoryStore,
+    search_provider: Literal["tavily", "noop"],
+) -> _SwarmAgents:
+    semantic_cache = (
+        _get_semantic_cache(
+            cfg.redis_url, cfg.semantic_cache_threshold, cfg.semantic_cache_size
+        )
+        if cfg.enable_semantic_cache
+        else None
+    )
     search_client = SearchClient(
         provider=search_provider,
         api_key=cfg.tavily_api_key,
         default_k=cfg.researcher_batch_size,
+        semantic_cache=semantic_cache,
     )
 
-    planner_model = _create_llm(cfg, temperature=0.2, model=cfg.researcher_8bit_model)
-    synthesizer_model = _create_llm(cfg, temperature=0.3, model=cfg.synth_eval_model)
-    evaluator_model = _create_llm(cfg, temperature=0.0, model=cfg.synth_eval_model)
-    output_dir = Path(__file__).resolve().parent.parent
+    models = _create_models(cfg)
+    planner_model = models["planner"]
+    synthesizer_model = models["synthesizer"]
+    evaluator_model = models["evaluator"]
 
     planner = PlannerAgent(
         planner_model,
         memory=memory,
         max_subtopics=cfg.max_subtopics,
+        cache_system_prompt=cfg.prompt_cache_control,
+        enable_tracing=cfg.enable_tracing,
     )
-    researcher_profiles = [
-    # === Scouts (4-bit, breadth, low-noise, same temp) ===
-    {
-        "name": "scout-alpha",
-        "model": cfg.researcher_4bit_model,
-        "temperature": 0.14,
-        "top_p": 0.95,
-        "system_prompt": BASE_SYSTEM + "\nROLE: Fast-turnaround evidence scout; prefer crisp, atomic facts.",
-        "user_prompt": dedent(
-            """\
-            Topic: {topic}
-
-            Sources:
-            {sources}
-            Task: Produce EXACTLY three short factual sentences, each with an inline citation [id].
-            Return the JSON schema only."""
-        ),
-    },
-    {
-        "name": "scout-beta",
-        "model": cfg.researcher_4bit_model,
-        "temperature": 0.14,
-        "top_p": 0.95,
-        "system_prompt": BASE_SYSTEM + "\nROLE: Coverage-focused scout; surface the biggest takeaways and divergent viewpoints.",
-        "user_prompt": dedent(
-            """\
-            Topic: {topic}
-
-            Sources:
-            {sources}
-            Task: Summarize the top findings in 3-5 sentences with inline citations [id].
-            Return the JSON schema only."""
-        ),
-    },
-    {
-        "name": "scout-gamma",
-        "model": cfg.researcher_4bit_model,
-        "temperature": 0.14,
-        "top_p": 0.95,
-        "system_prompt": BASE_SYSTEM + "\nROLE: Precision note-taker; prioritize numbers, dates, and named entities.",
-        "user_prompt": dedent(
-            """\
-            Topic: {topic}
-
-            Sources:
-            {sources}
-            Task: List 3-4 key facts emphasizing statistics/dates, with inline citations [id].
-            Return the JSON schema only."""
-        ),
-    },
-
-    # === Heavies (8-bit, depth/verification, even lower temp) ===
-    {
-        "name": "analyst-delta",
-        "model": cfg.researcher_8bit_model,
-        "temperature": 0.09,
-        "top_p": 0.90,
-        "system_prompt": BASE_SYSTEM + "\nROLE: Senior analyst; connect themes, call out contradictions, keep to evidence.",
-        "user_prompt": dedent(
-            """\
-            Topic: {topic}
-
-            Sources:
-            {sources}
-            Task: Write a cohesive mini-brief (4-6 sentences) that highlights agreements/conflicts.
-            Every sentence must have at least one inline citation [id]. Return the JSON schema only."""
-        ),
-    },
-    {
-        "name": "analyst-epsilon",
-        "model": cfg.researcher_8bit_model,
-        "temperature": 0.09,
-        "top_p": 0.90,
-        "system_prompt": BASE_SYSTEM + "\nROLE: Verification-minded analyst; separate well-supported facts from tentative items.",
-        "user_prompt": dedent(
-            """\
-            Topic: {topic}
-
-            Sources:
-            {sources}
-            Task: Produce a cautious summary (4-5 sentences) that labels uncertainties and grades reliability.
-            Cite each sentence with [id]. Return the JSON schema only."""
-        ),
-    },
-]
     researcher_members = [
         ResearcherAgent(
             profile["name"],
-            llm=_create_llm(
-                cfg,
-                temperature=profile["temperature"],
-                model=profile["model"],
-            ),
+            llm=models[profile["name"]],
             search_client=search_client,
             batch_size=cfg.researcher_batch_size,
             system_prompt=profile["system_prompt"],
             user_prompt=profile["user_prompt"],
+            role_prompt=profile["role_prompt"],
+            cache_system_prompt=cfg.prompt_cache_control,
+            enable_tracing=cfg.enable_tracing,
+            semantic_cache=semantic_cache,
+            stream_json=cfg.researcher_stream_json,
+            max_tokens=profile["max_tokens"],
         )
-        for profile in researcher_profiles
+        for profile in _RESEARCHER_PROFILES
     ]
-    researcher = ResearchTeamAgent(researcher_members, memory=memory)
-    synthesizer = SynthesizerAgent(
-        synthesizer_model,
+    researcher = ResearchTeamAgent(
+        researcher_members,
         memory=memory,
-        enable_evaluator=cfg.enable_evaluator,
+        max_concurrency=cfg.researcher_concurrency,
+        batch_subtopics=cfg.researcher_batch_subtopics,
     )
     publisher = PublisherAgent(
         synthesizer_model,
         memory=memory,
-        output_dir=output_dir,
+        output_dir=_OUTPUT_DIR,
+        cache_system_prompt=cfg.prompt_cache_control,
+        enable_tracing=cfg.enable_tracing,
+    )
+    synthesizer = SynthesizerAgent(
+        synthesizer_model,
+        memory=memory,
+        enable_evaluator=cfg.enable_evaluator,
+        cache_system_prompt=cfg.prompt_cache_control,
+        enable_tracing=cfg.enable_tracing,
+        # LangChain's stream path never consults the LLM cache; with caching on, synthesize via
+        # invoke (so repeats hit the cache) and leave the title to the publish_prep node.
+        title_generator=None if cfg.llm_cache else publisher.generate_title,
     )
     evaluator = (
-        EvaluatorAgent(evaluator_model, memory=memory) if cfg.enable_evaluator else None
+        EvaluatorAgent(
+            evaluator_model,
+            memory=memory,
+            cache_system_prompt=cfg.prompt_cache_control,
+            enable_tracing=cfg.enable_tracing,
+        )
+        if cfg.enable_evaluator
+        else None
     )
 
-    graph = build_research_graph(planner, researcher, synthesizer, publisher, evaluator)
-    state: ResearchState = {
-        "query": query,
-        "subtopics": [],
-        "drafts": {},
-        "synthesis": "",
-        "critique": "",
+    return _SwarmAgents(
+        planner=planner,
+        researcher=researcher,
+        synthesizer=synthesizer,
+        publisher=publisher,
+        evaluator=evaluator,
+        search_provider=search_client.provider,
+    )
+
+
+def _create_models(cfg: Settings) -> dict[str, ChatOpenAI]:
+    # Resolving the arguments validates settings and installs the LLM cache, so it stays
+    # serial; only the clients that have never been built are constructed in parallel.
+    specs = {
+        "planner": _llm_args(cfg, temperature=0.2, model=cfg.researcher_8bit_model),
+        "synthesizer": _llm_args(cfg, temperature=0.3, model=cfg.synth_eval_model),
+        "evaluator": _llm_args(cfg, temperature=0.0, model=cfg.synth_eval_model),
     }
-    final_state = graph.invoke(state)
-    memory.write(query, "final_state", final_state)
-    return ResearchResult(state=final_state, memory=memory, graph=graph)
+    for profile in _RESEARCHER_PROFILES:
+        specs[profile["name"]] = _researcher_llm_args(
+            cfg,
+            temperature=profile["temperature"],
+            model=getattr(cfg, profile["model_setting"]),
+        )
+    missing = {args for args in specs.values() if args not in _llm_clients}
+    if len(missing) > 1:
+        _shared_http_clients()
+        with ThreadPoolExecutor(max_workers=min(8, len(missing))) as executor:
+            list(executor.map(lambda args: _get_llm(*args), missing))
+    return {name: _get_llm(*args) for name, args in specs.items()}
+
+
+@lru_cache(maxsize=None)
+def _get_semantic_cache(
+    redis_url: str | None, threshold: float, max_entries: int
+) -> SemanticCache:
+    # Shared across workflow runs so the embedding model loads once per process.
+    return SemanticCache(
+        MemoryStore(namespace="semantic", redis_url=redis_url),
+        threshold=threshold,
+        max_entries=max_entries,
+    )
 
 
-def _create_llm(cfg: Settings, *, temperature: float, model: str | None = None) -> ChatOpenAI:
-    base_url = cfg.lm_studio_server
+@lru_cache(maxsize=None)
+def _get_checkpoints(path: str, ttl: float) -> CheckpointStore:
+    return CheckpointStore(path, ttl=ttl)
+
+
+@lru_cache(maxsize=None)
+def _install_llm_cache(database_path: str) -> None:
+    # Identical (prompt, model settings) pairs return the stored completion without a request.
+    # Imported here because langchain_community.cache pulls in SQLAlchemy.
+    from langchain_community.cache import SQLiteCache
+
+    set_llm_cache(_HashedLLMCache(SQLiteCache(database_path=database_path)))
+
+
+class _HashedLLMCache(BaseCache):
+    """Wraps an LLM cache so it is keyed by fixed-size digests instead of the full prompt."""
+
+    def __init__(self, inner: BaseCache) -> None:
+        self.inner = inner
+
+    def lookup(self, prompt: str, llm_string: str) -> Any:
+        return self.inner.lookup(_cache_key(prompt), _cache_key(llm_string))
+
+    def update(self, prompt: str, llm_string: str, return_val: Any) -> None:
+        self.inner.update(_cache_key(prompt), _cache_key(llm_string), return_val)
+
+    def clear(self, **kwargs: Any) -> None:
+        self.inner.clear(**kwargs)
+
+
+def _cache_key(text: str) -> str:
+    # Prompts run to many KB; index a short digest, tagged so a hasher change can't collide.
+    data = text.encode("utf-8")
+    if blake3 is not None:
+        return "b3:" + blake3.blake3(data).hexdigest()
+    if xxhash is not None:
+        return "xx:" + xxhash.xxh3_128_hexdigest(data)
+    return "b2:" + hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _create_batch_client(cfg: Settings) -> OpenAI:
+    api_key = cfg.openai_api_key
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY is required for batch execution.")
+    return OpenAI(api_key=api_key, base_url=cfg.lm_studio_server)
+
+
+def build_researcher_llm(
+    cfg: Settings, *, temperature: float, model: str | None = None
+) -> ChatOpenAI:
+    return _get_llm(*_researcher_llm_args(cfg, temperature=temperature, model=model))
+
+
+def _researcher_llm_args(
+    cfg: Settings, *, temperature: float, model: str | None = None
+) -> tuple[str, float, str | None, str, bool]:
+    # RESEARCHER_SERVER points the drafting calls at a separate OpenAI-compatible server
+    # (e.g. vLLM serving a quantized model), leaving the main server to planner/synthesizer.
+    return _llm_args(
+        cfg,
+        temperature=temperature,
+        model=model or cfg.researcher_4bit_model,
+        base_url=cfg.researcher_server,
+    )
+
+
+def _create_llm(
+    cfg: Settings,
+    *,
+    temperature: float,
+    model: str | None = None,
+    base_url: str | None = None,
+) -> ChatOpenAI:
+    return _get_llm(*_llm_args(cfg, temperature=temperature, model=model, base_url=base_url))
+
+
+def _llm_args(
+    cfg: Settings,
+    *,
+    temperature: float,
+    model: str | None = None,
+    base_url: str | None = None,
+) -> tuple[str, float, str | None, str, bool]:
+    base_url = base_url or cfg.lm_studio_server
+    if cfg.llm_cache:
+        _install_llm_cache(cfg.llm_cache_path)
     api_key = cfg.openai_api_key or ("lm-studio" if base_url else None)
     if not api_key:
         raise ValueError(
             "OPENAI_API_KEY not configured. Set it in your environment or a .env file."
         )
-    return ChatOpenAI(
-        model=model or cfg.openai_model,
+    return (model or cfg.openai_model, temperature, base_url, api_key, cfg.llm_cache)
+
+
+_http_clients: tuple[httpx.Client, httpx.AsyncClient] | None = None
+_http_clients_lock = threading.Lock()
+
+
+def _shared_http_clients() -> tuple[httpx.Client, httpx.AsyncClient]:
+    # One connection pool per mode for every role; HTTP/2 multiplexes requests when h2 is
+    # installed. Locked because _create_models builds clients from several threads at once.
+    global _http_clients
+    with _http_clients_lock:
+        if _http_clients is None:
+            options: dict[str, Any] = {
+                "http2": importlib.util.find_spec("h2") is not None,
+                "limits": httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                "timeout": httpx.Timeout(600.0, connect=5.0),
+            }
+            # Async connections bind to the loop that opens them; every async LLM call runs
+            # on run_sync's background loop, so the async pool is created there too.
+            _http_clients = (httpx.Client(**options), run_sync(_new_async_client(options)))
+        return _http_clients
+
+
+async def _new_async_client(options: dict[str, Any]) -> httpx.AsyncClient:
+    return httpx.AsyncClient(**options)
+
+
+# One client per configuration, shared by every role and run, over the shared pools. A plain
+# dict rather than lru_cache so _create_models can tell which clients still need building.
+_llm_clients: dict[tuple[str, float, str | None, str, bool], ChatOpenAI] = {}
+
+
+def _get_llm(
+    model: str,
+    temperature: float,
+    base_url: str | None,
+    api_key: str,
+    llm_cache: bool,
+) -> ChatOpenAI:
+    key = (model, temperature, base_url, api_key, llm_cache)
+    if (llm := _llm_clients.get(key)) is not None:
+        return llm
+    http_client, http_async_client = _shared_http_clients()
+    llm = ChatOpenAI(
+        model=model,
         temperature=temperature,
         api_key=api_key,
         base_url=base_url,
+        # None would fall back to the process-wide cache once any run has installed one.
+        cache=llm_cache,
+        http_client=http_client,
+        http_async_client=http_async_client,
     )
+    # Concurrent builders of the same key settle on whichever client landed first.
+    return _llm_clients.setdefault(key, llm)